@@ -201,6 +201,11 @@ export async function POST(request: NextRequest) {
         `temp_${Date.now()}_${jsonFilename}`,
       );
       tempFilesToDelete.push(tempJsonPath);
+      // tome_evaluation.py はJSONの隣に感情行列 (<JSON名>_emotion.npz) も出力する
+      // ルートの一覧 (分析JSONの検索に使用) を圧迫しないよう emotion/ 配下に保存する
+      const emotionFilename = `emotion/${jsonFilename.replace(/\.json$/, ".npz")}`;
+      const tempEmotionPath = tempJsonPath.replace(/\.json$/, "_emotion.npz");
+      tempFilesToDelete.push(tempEmotionPath);
 
       // --- 6. tome_evaluation.py を実行し、一時ファイルにJSONを書き込ませる ---
       console.log(
@@ -234,6 +239,32 @@ export async function POST(request: NextRequest) {
         );
         throw readUploadError; // 必要に応じてエラーハンドリングを調整してください
       }
+
+      // --- 8. 感情行列 (matrix, malformed, distilled の .npz) をアップロード ---
+      // 感情行列は補助データのため、失敗しても警告のみとし、JSONの保存結果は成功のまま扱う
+      try {
+        const emotionContent = await readFile(tempEmotionPath);
+        const { error: emotionUploadError } = await supabase
+          .storage
+          .from(STORAGE_BUCKET)
+          .upload(emotionFilename, emotionContent, {
+            contentType: "application/octet-stream",
+            upsert: true,
+          });
+
+        if (emotionUploadError) {
+          throw new Error(
+            `Supabase Storageへのアップロード失敗: ${emotionUploadError.message}`,
+          );
+        }
+
+        console.log(`Supabase Storageにアップロード完了: ${emotionFilename}`);
+      } catch (emotionError) {
+        console.warn(
+          `感情行列のアップロードをスキップしました (JSONは保存済み): ${tempEmotionPath}`,
+          emotionError,
+        );
+      }
     }
 
     return NextResponse.json({
@@ -246,7 +277,7 @@ export async function POST(request: NextRequest) {
       error: error.message,
     }, { status: 500 });
   } finally {
-    // --- 8. 一時ファイルを削除 ---
+    // --- 9. 一時ファイルを削除 ---
     console.log("一時ファイルを削除します:", tempFilesToDelete);
     for (const tempPath of tempFilesToDelete) {
       try {
@@ -0,0 +1,282 @@
+import os
+import sys
+import glob
+import json
+import time
+import pandas as pd
+import numpy as np
+import joblib
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+
+# --- 定数と設定 ---
+# tome_evaluation.py の感情分析 (emotion1) と発話抽出 (speech) を置き換える対象
+EMOTION_CLASSES = ["positive", "negative", "neutral"]
+NO_SPEECH = "no_speech"
+HAS_SPEECH = "has_speech"
+NO_SPEECH_OUTPUT = "該当なし"  # 発話がない場合の LLM の出力
+
+# この割合以上で LLM と一致する確信度を、置き換えのしきい値として採用する
+TARGET_AGREEMENT = 0.95
+# しきい値の採用に必要な、置き換えた calibration データの最小件数 (少数の偶然の一致で採用しないため)
+MIN_REPLACED_FOR_THRESHOLD = 30
+# しきい値の選択用 (calibration) と評価用 (test) にそれぞれ分けるデータの割合
+HOLDOUT_SIZE = 0.2
+CANDIDATE_THRESHOLDS = [0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.97, 0.99]
+
+
+def build_classifier():
+    """文字 n-gram の TF-IDF とロジスティック回帰による軽量な分類器を作る"""
+    return make_pipeline(
+        TfidfVectorizer(analyzer='char', ngram_range=(1, 3), min_df=2, sublinear_tf=True),
+        LogisticRegression(max_iter=1000),
+    )
+
+
+def load_labeled_examples(json_paths):
+    """
+    分析JSON (wide形式のリスト、または --long の {"data": [...]} 形式) から
+    記録の '内容' と、LLM が付けた感情・発話の有無のラベルを読み込む
+    蒸留モデル自身の予測 (source_emotion / source_speech が 'distilled') は除外する
+    """
+    records = []
+    for json_path in json_paths:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('data', [])
+        records.extend(data)
+        print(f"読み込み: {json_path} ({len(data)} 件)", file=sys.stderr)
+
+    df = pd.DataFrame.from_records(records)
+    if '内容' not in df.columns:
+        raise KeyError("分析JSONに '内容' が見つかりません。")
+    df = df[df['内容'].notna()].copy()
+    df['text'] = df['内容'].astype(str)
+    df = df[df['text'].str.strip() != '']
+
+    def llm_labeled(task):
+        # source_* 列がない (蒸留モデル導入前の) JSON はすべて LLM のラベルとみなす
+        source_column = f'source_{task}'
+        if source_column not in df.columns:
+            return df
+        return df[df[source_column] != 'distilled']
+
+    examples = {}
+    if 'emotion1' in df.columns:
+        emotion = llm_labeled('emotion')
+        emotion = emotion[emotion['emotion1'].isin(EMOTION_CLASSES)]
+        examples['emotion'] = emotion.drop_duplicates(subset='text', keep='last')[['text', 'emotion1']] \
+            .rename(columns={'emotion1': 'label'})
+    if 'speech' in df.columns:
+        speech_df = llm_labeled('speech')
+        speech = speech_df[['text']].copy()
+        has_speech = speech_df['speech'].notna() \
+            & ~speech_df['speech'].astype(str).str.contains(NO_SPEECH_OUTPUT, regex=False)
+        speech['label'] = np.where(has_speech, HAS_SPEECH, NO_SPEECH)
+        examples['speech'] = speech.drop_duplicates(subset='text', keep='last')
+    return examples
+
+
+def replaceable_confidence(classifier, task, texts):
+    """
+    LLM の代わりに使える予測ラベルと、その確信度を返す。
+    発話は抽出文を生成できないため、「発話なし」の確率だけを確信度とする。
+    """
+    proba = classifier.predict_proba(texts)
+    classes = list(classifier.classes_)
+    if task == 'speech':
+        if NO_SPEECH not in classes:
+            return np.full(len(texts), NO_SPEECH, dtype=object), np.zeros(len(texts))
+        return np.full(len(texts), NO_SPEECH, dtype=object), proba[:, classes.index(NO_SPEECH)]
+    return np.asarray(classes, dtype=object)[proba.argmax(axis=1)], proba.max(axis=1)
+
+
+def evaluate(classifier, task, texts, labels):
+    """学習に使っていないデータで、しきい値ごとの置き換え率 (LLM呼び出し削減率) と LLM との一致率を計算する"""
+    start = time.perf_counter()
+    predicted, confidence = replaceable_confidence(classifier, task, texts)
+    elapsed = time.perf_counter() - start
+    labels = np.asarray(labels, dtype=object)
+
+    rows = []
+    for threshold in CANDIDATE_THRESHOLDS:
+        replaced = confidence >= threshold
+        rows.append({
+            'threshold': threshold,
+            'replaced': int(replaced.sum()),
+            'llm_call_reduction': float(replaced.mean()),
+            'agreement': float((predicted[replaced] == labels[replaced]).mean()) if replaced.any() else None,
+        })
+    report = {
+        'size': int(len(labels)),
+        'rows_per_second': float(len(labels) / elapsed) if elapsed > 0 else None,
+        'thresholds': rows,
+    }
+    if task == 'emotion':
+        report['overall_agreement'] = float((predicted == labels).mean())
+    return report
+
+
+def choose_threshold(report):
+    """
+    置き換えた件数が MIN_REPLACED_FOR_THRESHOLD 以上で、一致率が TARGET_AGREEMENT 以上となる
+    最小のしきい値を選ぶ (なければ置き換えない)
+    """
+    for row in report['thresholds']:
+        if row['replaced'] < MIN_REPLACED_FOR_THRESHOLD:
+            continue
+        if row['agreement'] is not None and row['agreement'] >= TARGET_AGREEMENT:
+            return row['threshold']
+    return None
+
+
+def split_for_evaluation(data):
+    """
+    学習用・しきい値選択用 (calibration)・評価用 (test) に層化分割する。
+    ラベルの件数が少なく分割できない場合は None を返す。
+    """
+    counts = data['label'].value_counts()
+    n_holdout = int(len(data) * HOLDOUT_SIZE)
+    if counts.min() < 2 or n_holdout < len(counts):
+        return None
+    try:
+        train_df, holdout_df = train_test_split(
+            data, test_size=2 * n_holdout, random_state=0, stratify=data['label']
+        )
+        calibration_df, test_df = train_test_split(
+            holdout_df, test_size=0.5, random_state=0, stratify=holdout_df['label']
+        )
+    except ValueError:
+        return None
+    return train_df, calibration_df, test_df
+
+
+def train_task(task, data):
+    """
+    一つのタスクの分類器を学習する。しきい値は calibration データで選び、
+    レポートの一致率・削減率はしきい値の選択に使っていない test データで計算する
+    """
+    splits = split_for_evaluation(data)
+    if splits is None:
+        return None
+    train_df, calibration_df, test_df = splits
+
+    classifier = build_classifier().fit(train_df['text'], train_df['label'])
+    calibration = evaluate(classifier, task, calibration_df['text'].tolist(), calibration_df['label'])
+    threshold = choose_threshold(calibration)
+
+    task_report = evaluate(classifier, task, test_df['text'].tolist(), test_df['label'])
+    task_report['training_size'] = int(len(data))
+    task_report['calibration_size'] = int(len(calibration_df))
+    task_report['selected_threshold'] = threshold
+
+    # 評価後、全データで学習し直して保存する
+    model = {
+        'classifier': build_classifier().fit(data['text'], data['label']),
+        'threshold': threshold,
+    }
+    return model, task_report
+
+
+def train(json_paths, model_path):
+    """
+    分析JSONの LLM ラベルで感情・発話の分類器を学習し、評価レポートとともに保存する
+    """
+    examples = load_labeled_examples(json_paths)
+    bundle = {}
+    report = {}
+    for task in ['emotion', 'speech']:
+        data = examples.get(task)
+        trained = None
+        if data is not None and data['label'].nunique() >= 2:
+            try:
+                trained = train_task(task, data)
+            except ValueError as e:
+                print(f"警告: {task} の学習に失敗しました: {e}", file=sys.stderr)
+                continue
+        if trained is None:
+            print(f"警告: {task} の学習データが不足しているためスキップします。", file=sys.stderr)
+            continue
+
+        bundle[task], report[task] = trained
+        print(f"{task}: 学習 {len(data)} 件, しきい値 {bundle[task]['threshold']}", file=sys.stderr)
+
+    if not bundle:
+        raise ValueError("学習できる分類器がありませんでした。")
+
+    # 選択したしきい値での test データの一致率と、感情分析・発話抽出を合わせた LLM 呼び出し削減率
+    summary = {}
+    for task, task_report in report.items():
+        selected = next(
+            (row for row in task_report['thresholds'] if row['threshold'] == task_report['selected_threshold']),
+            {'llm_call_reduction': 0.0, 'agreement': None},
+        )
+        summary[task] = {'llm_call_reduction': selected['llm_call_reduction'], 'agreement': selected['agreement']}
+    summary['combined_llm_call_reduction'] = float(np.mean(
+        [summary.get(task, {'llm_call_reduction': 0.0})['llm_call_reduction'] for task in ['emotion', 'speech']]
+    ))
+    report = {'summary': summary, **report}
+
+    output_dir = os.path.dirname(model_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    joblib.dump(bundle, model_path)
+
+    report_path = f"{os.path.splitext(model_path)[0]}_report.json"
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report, ensure_ascii=False, indent=2), file=sys.stderr)
+    return report_path
+
+
+def load_distilled_models(model_path):
+    """train() で保存した分類器を読み込む"""
+    return joblib.load(model_path)
+
+
+def distilled_outputs(bundle, task, texts):
+    """
+    確信度がしきい値以上の行について、LLM の出力と同じ形式の文字列を返す。
+    LLM に問い合わせるべき行は None とする。
+    """
+    outputs = [None] * len(texts)
+    model = bundle.get(task)
+    if model is None or model['threshold'] is None or not texts:
+        return outputs
+
+    predicted, confidence = replaceable_confidence(model['classifier'], task, texts)
+    for i in np.flatnonzero(confidence >= model['threshold']):
+        if task == 'speech':
+            outputs[i] = NO_SPEECH_OUTPUT
+        else:
+            outputs[i] = f"summative:{predicted[i]}"
+    return outputs
+
+
+# --- スクリプト実行部分 ---
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        model_path = sys.argv[1]
+        json_paths = []
+        for path in sys.argv[2:]:
+            if os.path.isdir(path):
+                json_paths.extend(sorted(glob.glob(os.path.join(path, '*_analysis.json'))))
+            else:
+                json_paths.append(path)
+
+        try:
+            report_path = train(json_paths, model_path)
+        except (FileNotFoundError, KeyError, ValueError) as e:
+            print(f"エラー: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        # stdoutにはファイルパスのみを出力
+        print(os.path.abspath(model_path))
+        print(os.path.abspath(report_path))
+    else:
+        print("エラー: 出力モデルパスと分析JSON (またはそのディレクトリ) が必要です。", file=sys.stderr)
+        print("使用法: python distill_classifier.py <model_path> <analysis_json_or_dir>...", file=sys.stderr)
+        sys.exit(1)
@@ -1,6 +1,7 @@
 import os
 import sys
 import pandas as pd
+import numpy as np
 import re
 import json
 import asyncio
@@ -170,10 +171,146 @@ Context: {context}
 
 Sentence: {sentence}"""
 
+# EMOTION_TEMPLATE が出力する感情ラベル (この順序で感情行列の列を並べる)
+EMOTION_LABELS = [
+    "joy", "thankfulness", "relaxation", "love", "interest", "pleasure", "hope",
+    "sadness", "surprise", "anger", "disgust", "fear", "contempt", "neutral",
+]
+EMOTION_SCORE_PATTERN = (
+    r'(?<![a-z])(?P<label>' + '|'.join(EMOTION_LABELS) + r')\s*[:：]\s*(?P<score>\d+(?:\.\d+)?|\.\d+)'
+)
+
+
+def parse_emotion_distributions(raw_outputs):
+    """
+    感情分析チェーンの出力 (行ごとの文字列) から、14感情の割合を一括で抽出する。
+    戻り値は (行数 × 14) の float32 行列と、不正な行を示す bool 配列。
+    各行は合計 1.0 に再正規化し、割合が一つも読み取れない行は NaN で埋める。
+    """
+    outputs = pd.Series(raw_outputs, dtype='object').fillna('').astype(str)
+    n_rows = len(outputs)
+
+    # 全行をまとめて正規表現で抽出 (行ごとのループは行わない)
+    extracted = outputs.str.extractall(EMOTION_SCORE_PATTERN, flags=re.IGNORECASE)
+    if extracted.empty:
+        matrix = np.full((n_rows, len(EMOTION_LABELS)), np.nan, dtype=np.float32)
+        return matrix, np.ones(n_rows, dtype=bool)
+
+    extracted['label'] = extracted['label'].str.lower()
+    extracted['score'] = extracted['score'].astype(np.float32)
+    extracted = extracted.droplevel('match').reset_index(names='row')
+    # 同じ感情が複数回出力された場合は最初の値を採用
+    extracted = extracted.drop_duplicates(subset=['row', 'label'], keep='first')
+
+    scores = (
+        extracted.pivot(index='row', columns='label', values='score')
+        .reindex(index=range(n_rows), columns=EMOTION_LABELS)
+    )
+    matrix = scores.to_numpy(dtype=np.float32)
+
+    # 出力されなかった感情は 0 とみなし、合計が 0 以下の行を不正とする
+    matrix = np.nan_to_num(matrix, nan=0.0)
+    totals = matrix.sum(axis=1, keepdims=True)
+    malformed = totals[:, 0] <= 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        matrix = matrix / totals
+    matrix[malformed] = np.nan
+    return matrix.astype(np.float32), malformed
+
+
+def emotion_matrix_path(output_json_path):
+    """分析JSONと同じ場所に置く感情行列 (.npz) のパスを返す"""
+    base, _ = os.path.splitext(output_json_path)
+    return f"{base}_emotion.npz"
+
+
+def label_sources(distilled):
+    """各行のラベルの出所 ('llm' または 'distilled') を返す"""
+    return ['distilled' if output is not None else 'llm' for output in distilled]
+
+
+# long形式の分析結果 (1行 = 記録1件の抽出結果1つ)
+LONG_RESULT_COLUMNS = ['row_id', 'kind', 'ordinal', 'value']
+# 出力時に展開する kind と、従来の wide 形式での列名の接頭辞 (ICF抽象化の中間結果は出力しない)
+WIDE_COLUMN_PREFIXES = {'personality': 'person', 'icf': 'icf'}
+
+
+def to_long_results(values, kind):
+    """
+    row_id を第1レベルに持つ Series (str.extractall の結果など) を long形式の表に変換する。
+    ordinal は記録ごとに 1 から振り直す。
+    """
+    values = values[values.notna()]
+    return pd.DataFrame({
+        'row_id': values.index.get_level_values(0),
+        'kind': kind,
+        'ordinal': values.groupby(level=0).cumcount().to_numpy() + 1,
+        'value': values.to_numpy(dtype=object),
+    }, columns=LONG_RESULT_COLUMNS)
+
+
+def extract_personality_long(raw_outputs, index):
+    """パーソナル情報抽象化の出力から '(タグ)内容' を全行まとめて抽出する"""
+    outputs = pd.Series(raw_outputs, index=index, dtype='object').fillna('').astype(str)
+    # extractall は空のグループを NaN にするため、連結前に空文字列に戻す
+    matches = outputs.str.extractall(r'output:\s*\((.*?)\)\s*(.*)', flags=re.IGNORECASE).fillna('')
+    values = '(' + matches[0].str.strip() + ')' + matches[1].str.strip()
+    return to_long_results(values, 'personality')
+
+
+def extract_icf_abstraction_long(raw_outputs, index):
+    """
+    ICF抽象化の出力から 'abstraction:' の内容を全行まとめて抽出する。
+    'abstraction:' が一つもない行は、LLMが指示を無視したとみなし
+    '(カテゴリ) 内容' 形式の行を代わりに抽出する。
+    """
+    outputs = pd.Series(raw_outputs, index=index, dtype='object').fillna('').astype(str)
+    # extractall は空のグループ (中身のない 'abstraction:' 行など) を NaN にするため、空文字列に戻す
+    inner = outputs.str.extractall(r'abstraction:\s*(.*?)(?=\n|$)', flags=re.IGNORECASE)[0].fillna('')
+
+    rows_without_abstraction = ~outputs.index.isin(inner.index.get_level_values(0))
+    fallback = outputs[rows_without_abstraction].str.extractall(r'^\s*\((.*?)\)\s*(.*?)(?=\n|$)', flags=re.MULTILINE).fillna('')
+    fallback_values = '(' + fallback[0].str.strip() + ') ' + fallback[1].str.strip()
+
+    # "該当なし" のような不要なマッチや空文字列を除外
+    values = pd.concat([inner, fallback_values]).sort_index().str.strip()
+    values = values[(values != '') & ~values.str.contains('該当なし', regex=False, na=False)]
+    return to_long_results(values, 'icf_abstraction')
+
+
+def pivot_long_to_wide(long_results, kind, index):
+    """long形式の結果のうち kind のものを、従来の person1.., icf1.. のような wide 形式の列に展開する"""
+    prefix = WIDE_COLUMN_PREFIXES[kind]
+    part = long_results[long_results['kind'] == kind]
+    if part.empty:
+        return pd.DataFrame(index=index)
+    # 欠損が None として出力されるよう object 型にする
+    wide = part.pivot(index='row_id', columns='ordinal', values='value').reindex(index).astype(object)
+    wide.columns = [f'{prefix}{ordinal}' for ordinal in wide.columns]
+    return wide
+
+
+async def abatch_with_distilled(chain, inputs, distilled):
+    """
+    distilled[i] が None の行だけ LLM チェーンをバッチ実行し、
+    それ以外の行は distilled[i] を LLM の出力として扱う
+    """
+    llm_positions = [i for i, output in enumerate(distilled) if output is None]
+    llm_outputs = await chain.abatch([inputs[i] for i in llm_positions]) if llm_positions else []
+    outputs = list(distilled)
+    for i, output in zip(llm_positions, llm_outputs):
+        outputs[i] = output
+    return outputs
+
+
 # --- ★ メイン実行関数 (非同期) ★ ---
-async def main(input_csv_path, output_json_path):
+async def main(input_csv_path, output_json_path, long_format=False):
     """
     単一のCSVファイルを非同期バッチ処理し、単一のJSONとして保存する
+    long_format=True の場合、パーソナル情報とICFコードを wide 形式の列に展開せず、
+    long形式 (row_id, kind, ordinal, value) のまま出力する (分析・学習用。バケットには置かない)
+    環境変数 DISTILLED_MODEL_PATH が設定されている場合、distill_classifier.py で学習した
+    分類器の確信度が高い行は感情分析・発話抽出の LLM 呼び出しを省略する
     """
     try:
         # --- 1. 環境変数とモデルの読み込み ---
@@ -192,6 +329,13 @@ async def main(input_csv_path, output_json_path):
             print("エラー: Spacyモデル 'ja_core_news_trf' が見つかりません。", file=sys.stderr)
             sys.exit(1)
 
+        distilled_model = None
+        distilled_model_path = os.environ.get("DISTILLED_MODEL_PATH")
+        if distilled_model_path:
+            from distill_classifier import load_distilled_models
+            distilled_model = load_distilled_models(distilled_model_path)
+            print(f"蒸留モデル '{distilled_model_path}' の読み込み完了。", file=sys.stderr) ### DEBUG ###
+
         # --- 2. LangChainコンポーネントの設定 ---
         print("--- 2. LangChainコンポーネントの設定 ---", file=sys.stderr) ### DEBUG ###
         chatmodel = ChatOpenAI(temperature=1, model="gpt-5-mini", api_key=openai_api_key)
@@ -250,161 +394,125 @@ async def main(input_csv_path, output_json_path):
         results = {}
         anon_inputs = [{"input": str(c)} for c in df['anonymized_content']]
 
+        # 蒸留モデルで置き換える行 (None の行は LLM に問い合わせる)
+        distilled = {"speech": [None] * len(df), "emotion": [None] * len(df)}
+        if distilled_model is not None:
+            from distill_classifier import distilled_outputs
+            texts = [str(c) if pd.notna(c) else "" for c in df['内容']]
+            for task in distilled:
+                distilled[task] = distilled_outputs(distilled_model, task, texts)
+                n_distilled = sum(o is not None for o in distilled[task])
+                print(f"   蒸留モデルで置き換え ({task}): {n_distilled} / {len(df)} 行", file=sys.stderr) ### DEBUG ###
+
         # 5-1. 発話抽出 (Speech)
         print("   5-1. 発話抽出 実行中...", file=sys.stderr) ### DEBUG ###
-        raw_outputs_speech = await chains['speech'].abatch(anon_inputs)
+        raw_outputs_speech = await abatch_with_distilled(chains['speech'], anon_inputs, distilled['speech'])
         speech_outputs = [re.sub(r'^output:\s*', '', o, flags=re.IGNORECASE).strip() or None for o in raw_outputs_speech]
         results['speech'] = speech_outputs
+        # 蒸留モデルの予測を次回の学習データに混ぜないよう、ラベルの出所を記録する
+        # (フロントエンドは 'emotion' で始まるキーを感情として集計するため、'source_' を接頭辞とする)
+        results['source_speech'] = label_sources(distilled['speech'])
         print("   発話抽出 完了", file=sys.stderr) ### DEBUG ###
 
         # 5-2. パーソナル情報抽象化 (Personality)
-        
+        # パーソナル情報・ICF抽象化・ICFコードは long形式 (row_id, kind, ordinal, value) で保持する
         print("   5-2. パーソナル情報抽象化 実行中...", file=sys.stderr) ### DEBUG ###
-        personality_outputs = []
         raw_outputs_pers = await chains['personality'].abatch(anon_inputs)
-        for output in raw_outputs_pers:
-            matches = re.findall(r'output:\s*\((.*?)\)\s*(.*)', output, flags=re.IGNORECASE)
-            personality_outputs.append([f"({tag.strip()}){text.strip()}" for tag, text in matches] if matches else [])
-        max_person = max(len(p) for p in personality_outputs) if personality_outputs else 0
-        person_data = {f'person{j+1}': [p[j] if j < len(p) else None for p in personality_outputs] for j in range(max_person)}
-        results['personality'] = pd.DataFrame(person_data, index=df.index)
+        results['personality'] = extract_personality_long(raw_outputs_pers, df.index)
         print("   パーソナル情報抽象化 完了", file=sys.stderr) ### DEBUG ###
 
         # 5-3. ICF抽象化 (ICF Abstraction)
         print("   5-3. ICF抽象化 実行中...", file=sys.stderr) ### DEBUG ###
         raw_outputs_icf_abst = await chains['icf_abstraction'].abatch(anon_inputs)
-        icf_abstraction_outputs = []
-        
-        # ▼▼▼【ここを差し替え】▼▼▼
-        for output in raw_outputs_icf_abst:
-            # 1. まず、指示通り 'abstraction:' を探す
-            inner_matches = re.findall(r'abstraction:\s*(.*?)(?=\n|$)', output, re.IGNORECASE)
-            
-            # 2. もし 'abstraction:' が見つからなければ、LLMが指示を無視したと仮定し、
-            #    プロンプトのExamples ('(趣味)「野菜を〜」') を参考に、
-            #    '(カテゴリ) 内容' の形式の行を強引に抽出する。
-            if not inner_matches:
-                # ^\s* -> 行頭（と任意の空白）
-                # \((.*?)\)  -> (カテゴリ)
-                # \s*(.*?) -> 内容
-                # (?=\n|$) -> 行末または文字列末尾まで
-                fallback_matches = re.findall(r'^\s*\((.*?)\)\s*(.*?)(?=\n|$)', output, re.MULTILINE)
-                
-                # findall はタプルのリスト [('睡眠', '良眠'), ('排泄', '夜間1回')] を返すため、
-                # '(睡眠) 良眠' の形式の文字列リストに再結合する
-                inner_matches = [f"({m[0].strip()}) {m[1].strip()}" for m in fallback_matches]
-
-            # "該当なし" のような不要なマッチや空文字列を除外
-            valid_matches = [
-                m.strip() for m in inner_matches if m.strip() and "該当なし" not in m
-            ]
-
-            if valid_matches:
-                icf_abstraction_outputs.append(valid_matches)
-            else:
-                icf_abstraction_outputs.append([])
-        # ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲
-        
-        max_icf_abst = max(len(icf) for icf in icf_abstraction_outputs) if icf_abstraction_outputs else 0
-        icf_abst_data = {f'icf_abst{j+1}': [icf[j] if j < len(icf) else None for icf in icf_abstraction_outputs] for j in range(max_icf_abst)}
-        results['icf_abstraction'] = pd.DataFrame(icf_abst_data, index=df.index)
+        results['icf_abstraction'] = extract_icf_abstraction_long(raw_outputs_icf_abst, df.index)
 
 
         # 5-4. 感情分析 (Emotion)
         print("   5-4. 感情分析 実行中...", file=sys.stderr) ### DEBUG ###
-        raw_outputs_emotion = await chains['emotion'].abatch(anon_inputs)
+        raw_outputs_emotion = await abatch_with_distilled(chains['emotion'], anon_inputs, distilled['emotion'])
         emotion_outputs = []
         for output in raw_outputs_emotion:
             match = re.search(r'summative:\s*(positive|negative|neutral)', output, re.IGNORECASE)
             emotion_outputs.append(match.group(1).lower() if match else "neutral")
 
-        results['emotion'] = pd.DataFrame({'emotion1': emotion_outputs}, index=df.index)
+        results['emotion'] = pd.DataFrame({
+            'emotion1': emotion_outputs,
+            'source_emotion': label_sources(distilled['emotion']),
+        }, index=df.index)
+
+        # 14感情の割合は行列として保持する (JSONの行と同じ順序)
+        # 蒸留モデルで置き換えた行は割合を持たないため NaN とし、不正な行とは別のフラグで区別する
+        emotion_matrix, emotion_malformed = parse_emotion_distributions(raw_outputs_emotion)
+        emotion_distilled = np.array([o is not None for o in distilled['emotion']], dtype=bool)
+        emotion_malformed &= ~emotion_distilled
+        results['emotion_matrix'] = {
+            'matrix': emotion_matrix,
+            'malformed': emotion_malformed,
+            'distilled': emotion_distilled,
+        }
+        if emotion_malformed.any():
+            n_scored = int((~emotion_distilled).sum())
+            print(f"   警告: 感情の割合を読み取れなかった行: {int(emotion_malformed.sum())} / {n_scored}", file=sys.stderr)
         print("   感情分析 完了", file=sys.stderr) ### DEBUG ###
 
         # 5-5. ICFラベリング (ICF Labeling) - 5-3の結果を使用
         print("   5-5. ICFラベリング 実行中...", file=sys.stderr) ### DEBUG ###
         df_icf_abst = results['icf_abstraction']
-        icf_abst_cols = [col for col in df_icf_abst.columns if col.startswith('icf_abst')]
-
-        tasks = []
-        for i, row in df_icf_abst.iterrows():
-            for col_idx, col_name in enumerate(icf_abst_cols):
-                abst_text = row[col_name]
-                if pd.notna(abst_text) and str(abst_text).strip():
-                    tasks.append((i, f'icf{col_idx+1}', str(abst_text)))
+        tasks = list(zip(df_icf_abst['row_id'], df_icf_abst['ordinal'], df_icf_abst['value'].astype(str)))
 
         print(f"### DEBUG ### ICFラベリング 入力タスク数: {len(tasks)}", file=sys.stderr) ### DEBUG ###
         if tasks:
              print(f"### DEBUG ### ICFラベリング 入力タスク (最初の5件): {tasks[:5]}", file=sys.stderr) ### DEBUG ###
 
 
-        icf_labeling_results_df = pd.DataFrame(index=df.index)
+        icf_codes = []
         if tasks:
-            # processed_codes_map を使わず、DataFrameに直接書き込む
-            
             print(f"### DEBUG ### ICFラベリング 逐次実行開始 (タスク数: {len(tasks)})", file=sys.stderr) ### DEBUG ###
-            
+
             try:
-                for (row_index, col_key, abst_text) in tasks:
+                for (row_id, ordinal, abst_text) in tasks:
                     # 1件ずつチェーンを実行
                     icf_code = await chains['code'].ainvoke(abst_text)
-                    
+
                     print(f"### DEBUG ### [ICF Raw Output] {icf_code}", file=sys.stderr)
 
-                    # 1件ずつパース
+                    # 1件ずつパースし、ICF抽象化と同じ ordinal で long形式の行として追加
                     code_match = re.search(r'([a-z]\d{3})', icf_code, re.IGNORECASE)
-                    processed_code = code_match.group(1).lower() if code_match else None
-                    
-                    if processed_code:
-                        # (A) この列が初めてか確認
-                        if col_key not in icf_labeling_results_df.columns:
-                            # (B) 列を `dtype='object'` で作成（indexはdf.indexと自動で揃う）
-                            icf_labeling_results_df[col_key] = pd.Series(dtype='object')
-                        
-                        # (C) .loc を使って、正しい行インデックスと列名に値を設定
-                        icf_labeling_results_df.loc[row_index, col_key] = processed_code
-                         
-                print(f"### DEBUG ### ICFラベリング 逐次実行完了", file=sys.stderr) ### DEBUG ###
-                
-                # (D) 処理後のDataFrameの状態をデバッグ
-                print(f"### DEBUG ### ICF DFは空か？: {icf_labeling_results_df.empty}", file=sys.stderr)
-                print(f"### DEBUG ### ICF DFの列名: {icf_labeling_results_df.columns.tolist()}", file=sys.stderr)
+                    if code_match:
+                        icf_codes.append((row_id, 'icf', ordinal, code_match.group(1).lower()))
 
+                print(f"### DEBUG ### ICFラベリング 逐次実行完了", file=sys.stderr) ### DEBUG ###
 
             except Exception as invoke_error:
                 print(f"   警告: ICFラベリングの逐次実行中にエラー: {invoke_error}", file=sys.stderr)
-            # ▲▲▲【ここまで修正】▲▲▲
         else:
              print("### DEBUG ### ICFラベリング対象なし", file=sys.stderr) ### DEBUG ###
 
-        results['icf_labeling'] = icf_labeling_results_df
+        results['icf_labeling'] = pd.DataFrame(icf_codes, columns=LONG_RESULT_COLUMNS)
         print("   ICFラベリング 完了", file=sys.stderr) ### DEBUG ###
-        print("### DEBUG ### ICFラベリング 結果DataFrame (最初の5行):", file=sys.stderr) ### DEBUG ###
-        print(results['icf_labeling'].head().to_string(), file=sys.stderr) ### DEBUG ###
-        # ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲
+        print(f"### DEBUG ### ICFラベリング 結果件数: {len(results['icf_labeling'])}", file=sys.stderr) ### DEBUG ###
+
+        # ICF抽象化の中間結果は出力に含めない
+        long_results = pd.concat([results['personality'], results['icf_labeling']], ignore_index=True)
 
         # --- 6. 元データと分析結果の結合 ---
         print("--- 6. 結果の結合 ---", file=sys.stderr) ### DEBUG ###
         df_final = df.drop(columns=['anonymized_content'])
         df_final['speech'] = results['speech']
+        df_final['source_speech'] = results['source_speech']
 
-        if 'personality' in results and not results['personality'].empty:
-             df_final = pd.concat([df_final, results['personality']], axis=1)
-
-        df_final = pd.concat([df_final, results['emotion']], axis=1)
-
-        # ICF抽象化の中間結果は結合しない
-
-        if 'icf_labeling' in results and not results['icf_labeling'].empty:
-            df_final = pd.concat([df_final, results['icf_labeling']], axis=1)
-        print(f"### DEBUG ### 結合後の列名: {df_final.columns.tolist()}", file=sys.stderr) ### DEBUG ###
-        # ICF列が存在するか確認
-        icf_cols_in_final = [col for col in df_final.columns if col.startswith('icf')]
-        if icf_cols_in_final:
-             print("### DEBUG ### 結合後DataFrameのICF列 (最初の5行):", file=sys.stderr) ### DEBUG ###
-             print(df_final[icf_cols_in_final].head().to_string(), file=sys.stderr) ### DEBUG ###
+        if long_format:
+            # long形式: person/icf 列は作らず、結果表をそのまま出力する
+            df_final = pd.concat([df_final, results['emotion']], axis=1)
         else:
-             print("### DEBUG ### 結合後DataFrameにICF列が存在しません", file=sys.stderr) ### DEBUG ###
+            # wide形式 (従来互換): 出力直前に person1.., icf1.. 列へ展開する
+            df_final = pd.concat([
+                df_final,
+                pivot_long_to_wide(long_results, 'personality', df.index),
+                results['emotion'],
+                pivot_long_to_wide(long_results, 'icf', df.index),
+            ], axis=1)
+        print(f"### DEBUG ### 結合後の列名: {df_final.columns.tolist()}", file=sys.stderr) ### DEBUG ###
 
         # --- 7. JSON形式に変換 ---
         print("--- 7. JSON形式への変換 ---", file=sys.stderr) ### DEBUG ###
@@ -424,6 +532,15 @@ async def main(input_csv_path, output_json_path):
         # NaN/NaT を None に変換
         df_final = df_final.where(pd.notna(df_final), None)
         json_data = df_final.to_dict(orient='records')
+        if long_format:
+            # 'data' は従来の wide 形式と同じ読み込み方 ({ data: [...] }) で読めるが、person/icf 列を含まない
+            # (フロントエンドはこれらを 'results' から読まないため、--long の出力はバケットに置かない)
+            # row_id は data の行インデックスに対応する
+            long_results = long_results.astype({'row_id': 'int64', 'ordinal': 'int64'})
+            json_data = {
+                'data': json_data,
+                'results': long_results.to_dict(orient='records'),
+            }
 
         # --- 8. JSONファイルとして保存 ---
         print(f"--- 8. JSONファイル保存 ({output_json_path}) ---", file=sys.stderr) ### DEBUG ###
@@ -435,6 +552,12 @@ async def main(input_csv_path, output_json_path):
             json.dump(json_data, f, ensure_ascii=False, indent=2)
 
         print(f"JSONファイルの保存完了。", file=sys.stderr) ### DEBUG ###
+
+        # 感情行列 (matrix: 行数 × 14, float32) と不正な行・蒸留モデルで置き換えた行のフラグを
+        # JSONの隣に .npz で保存
+        emotion_npz_path = emotion_matrix_path(output_json_path)
+        np.savez(emotion_npz_path, **results['emotion_matrix'])
+        print(f"感情行列の保存完了: {emotion_npz_path} {results['emotion_matrix']['matrix'].shape}", file=sys.stderr) ### DEBUG ###
         # ★★★ stdoutにはファイルパスのみを出力 ★★★
         print(os.path.abspath(output_json_path))
 
@@ -447,9 +570,11 @@ async def main(input_csv_path, output_json_path):
 
 # --- スクリプト実行部分 ---
 if __name__ == "__main__":
-    if len(sys.argv) > 2:
-        input_path = sys.argv[1]
-        output_path = sys.argv[2]  # ★ Node.jsから渡されたフルパスをそのまま使う
+    args = [a for a in sys.argv[1:] if a != '--long']
+    if len(args) > 1:
+        input_path = args[0]
+        output_path = args[1]  # ★ Node.jsから渡されたフルパスをそのまま使う
+        long_format = '--long' in sys.argv[1:]
 
         # デバッグログ（Node.jsのコンソールで見えるようにstderrに出力）
         print(f"Python実行開始: {sys.argv[0]}", file=sys.stderr)
@@ -458,9 +583,9 @@ if __name__ == "__main__":
 
         # メイン処理を実行
         # ※ main関数の中で output_path に向かって保存するように実装されている必要があります
-        asyncio.run(main(input_path, output_path))
+        asyncio.run(main(input_path, output_path, long_format=long_format))
         
     else:
         print("エラー: 入力CSVファイルパスと出力JSONファイルパスが必要です。", file=sys.stderr)
-        print("使用法: python tome_evaluation.py <input_csv_path> <output_json_path>", file=sys.stderr)
+        print("使用法: python tome_evaluation.py <input_csv_path> <output_json_path> [--long]", file=sys.stderr)
         sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# tome_evaluation.py はモジュール読み込み時に LangChain / spaCy を import する
+for module in ["langchain_openai", "langchain_experimental", "langchain_community", "spacy_curated_transformers"]:
+    pytest.importorskip(module)
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+from tome_evaluation import (  # noqa: E402
+    extract_icf_abstraction_long,
+    extract_personality_long,
+    pivot_long_to_wide,
+)
+
+
+def _values(long_results):
+    return list(zip(long_results["row_id"], long_results["ordinal"], long_results["value"]))
+
+
+def test_icf_abstraction_ignores_bare_abstraction_line():
+    outputs = ["abstraction: a\nabstraction:", "abstraction: b"]
+    long_results = extract_icf_abstraction_long(outputs, pd.RangeIndex(len(outputs)))
+    assert _values(long_results) == [(0, 1, "a"), (1, 1, "b")]
+
+
+def test_icf_abstraction_fallback_keeps_tag_without_text():
+    outputs = ["(睡眠) 良眠\n(排泄)", "abstraction: 該当なし"]
+    long_results = extract_icf_abstraction_long(outputs, pd.RangeIndex(len(outputs)))
+    assert _values(long_results) == [(0, 1, "(睡眠) 良眠"), (0, 2, "(排泄)")]
+
+
+def test_personality_keeps_empty_tag_or_text():
+    outputs = ["output: (趣味)", "output: ()text\noutput: (得意なこと) 棚の修理"]
+    long_results = extract_personality_long(outputs, pd.RangeIndex(len(outputs)))
+    assert _values(long_results) == [(0, 1, "(趣味)"), (1, 1, "()text"), (1, 2, "(得意なこと)棚の修理")]
+
+    wide = pivot_long_to_wide(long_results, "personality", pd.RangeIndex(len(outputs)))
+    assert wide.columns.tolist() == ["person1", "person2"]
+    assert wide.loc[0, "person2"] is None or pd.isna(wide.loc[0, "person2"])